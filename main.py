@@ -9,20 +9,33 @@
 # + 낙찰률 조회 API (NEW!)
 # ============================================
 
-from fastapi import FastAPI, HTTPException, Request
+from fastapi import FastAPI, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
+from starlette.exceptions import HTTPException as StarletteHTTPException
 from pydantic import BaseModel
-from typing import Optional, List
+from typing import Optional, List, Tuple, Dict
 import httpx
-import xml.etree.ElementTree as ET
-import anthropic
+import orjson
+import numpy as np
 import os
-import json
 import asyncio
+import hashlib
 import re
+import time
+import threading
+from bisect import bisect_right
+from functools import lru_cache
+from dataclasses import dataclass
+from types import MappingProxyType
+from collections import OrderedDict
 from datetime import date, datetime, timedelta
 
-app = FastAPI(title="N2B Backend v3.5", description="wise-bid + 가격정보API + 개략원가산출 + 공고매칭 + 낙찰률")
+app = FastAPI(
+    title="N2B Backend v3.5",
+    description="wise-bid + 가격정보API + 개략원가산출 + 공고매칭 + 낙찰률",
+    default_response_class=ORJSONResponse
+)
 
 app.add_middleware(
     CORSMiddleware,
@@ -32,6 +45,30 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# HTTPException 응답도 orjson으로 직렬화 (기본 핸들러는 stdlib json 사용)
+@app.exception_handler(StarletteHTTPException)
+async def http_exception_handler(request: Request, exc: StarletteHTTPException):
+    return ORJSONResponse(
+        status_code=exc.status_code,
+        content={"detail": exc.detail},
+        headers=getattr(exc, "headers", None)
+    )
+
+# ============================================
+# 공용 HTTP 클라이언트 (커넥션 풀 재사용)
+# ============================================
+@app.on_event("startup")
+async def startup_http_client():
+    app.state.http = httpx.AsyncClient(
+        timeout=30.0,
+        limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+        http2=True
+    )
+
+@app.on_event("shutdown")
+async def shutdown_http_client():
+    await app.state.http.aclose()
+
 # ============================================
 # API 키
 # ============================================
@@ -44,7 +81,7 @@ PREMIUM_KEY = os.getenv("PREMIUM_KEY", "wise2025")
 # ============================================
 # 공종별 표준 비율 DB (핵심!)
 # ============================================
-COST_RATIOS = {
+COST_RATIOS: Dict[str, dict] = {
     "도로": {"재료비": 55, "노무비": 25, "경비": 20, "description": "도로포장, 아스팔트"},
     "토목": {"재료비": 40, "노무비": 35, "경비": 25, "description": "토공, 기초"},
     "건축": {"재료비": 50, "노무비": 30, "경비": 20, "description": "건물 신축/개보수"},
@@ -70,6 +107,43 @@ COST_RATIOS = {
     "일반물품": {"재료비": 70, "노무비": 10, "경비": 20, "description": "일반 물품", "category": "물품"}
 }
 
+# 기초금액 대비 직접공사비/간접비 비중
+DIRECT_COST_RATIO = 0.74
+INDIRECT_COST_RATIO = 0.26
+# 직접공사비 1원당 간접비 (0.26 / 0.74)
+INDIRECT_PER_DIRECT = INDIRECT_COST_RATIO / DIRECT_COST_RATIO
+
+# 원가 산출용 공종 테이블 (요청마다 나눗셈/딕셔너리 조회하지 않도록 미리 계산)
+# (재료비 승수, 노무비 승수, 경비 승수, 재료비 %, 노무비 %, 경비 %, 설명)
+# 승수 = 직접공사비 비중 × 항목 비율 → 기초금액에 바로 곱함
+COST_RATIOS_F: Dict[str, Tuple[float, float, float, int, int, int, str]] = {
+    k: (
+        DIRECT_COST_RATIO * v["재료비"] / 100,
+        DIRECT_COST_RATIO * v["노무비"] / 100,
+        DIRECT_COST_RATIO * v["경비"] / 100,
+        v["재료비"], v["노무비"], v["경비"],
+        v["description"]
+    )
+    for k, v in COST_RATIOS.items()
+}
+DEFAULT_RATIOS_F = COST_RATIOS_F["기타"]
+
+# 일괄 산출용 비율 테이블 (행 = 공종, 열 = 재료비/노무비/경비)
+# 행 순서는 WORK_TYPE_INDEX와 같음. 단건 산출은 numpy 스칼라보다 빠른 위 tuple을 그대로 사용
+WORK_TYPE_INDEX = {k: i for i, k in enumerate(COST_RATIOS_F)}
+DEFAULT_WORK_TYPE_INDEX = WORK_TYPE_INDEX["기타"]
+RATIO_TABLE = np.array([v[:3] for v in COST_RATIOS_F.values()], dtype=np.float64)
+
+# 공고명에서 공종 추정용 패턴 (전체 공종명을 한 번에 스캔, 긴 이름 우선)
+WORK_TYPE_PATTERN = re.compile(
+    "|".join(map(re.escape, sorted((k for k in COST_RATIOS if k != "기타"), key=len, reverse=True)))
+)
+
+def infer_work_type(bid_name: str) -> str:
+    """공고명에 처음 등장하는 공종명 반환, 없으면 '기타'"""
+    m = WORK_TYPE_PATTERN.search(bid_name) if bid_name else None
+    return m.group() if m else "기타"
+
 # 간접비 비율 (직접공사비 대비)
 INDIRECT_RATIOS = {
     "간접노무비": 12.0,
@@ -95,36 +169,76 @@ LIMITS = {
     "cost": {"normal": 20, "premium": 200}
 }
 
-daily_usage: dict = {}
+# 기능별 (일반, 프리미엄) 한도 - 프리미엄 한도가 없으면 일반 한도 적용
+LIMITS_PACKED = {
+    k: (v.get("normal", 10), v.get("premium", v.get("normal", 10)))
+    for k, v in LIMITS.items()
+}
+
+# (날짜, IP) → 기능별 사용 횟수 [biz, proposal, agency, bid, cost, 기타]
+# 크기 상한이 있는 LRU: 상한 초과 시 가장 오래 안 쓴 항목부터 밀려나고,
+# 날짜가 바뀌면 지난 날짜 항목을 한 번에 정리
+# LIMITS에 없는 기능은 기본 한도(10회)를 마지막 공용 칸으로 함께 집계
+USAGE_MAX_ENTRIES = 100_000
+DEFAULT_LIMIT = 10
+USAGE_SLOTS = {k: i for i, k in enumerate(LIMITS)}
+USAGE_DEFAULT_SLOT = len(USAGE_SLOTS)
+
+daily_usage: OrderedDict = OrderedDict()
+daily_usage_lock = threading.Lock()
+usage_day = ""
+
+# 오늘 날짜 문자열은 매 요청 계산하지 않고 일정 주기로만 갱신
+TODAY_REFRESH_SEC = 60
+today_str = ""
+today_expires = 0.0
+
+def get_today() -> str:
+    global today_str, today_expires
+    now = time.monotonic()
+    if now >= today_expires:
+        today_str = str(date.today())
+        today_expires = now + TODAY_REFRESH_SEC
+    return today_str
 
 def get_client_ip(request: Request) -> str:
     forwarded = request.headers.get("x-forwarded-for")
     if forwarded:
-        return forwarded.split(",")[0].strip()
+        return forwarded.split(",", 1)[0].strip() if "," in forwarded else forwarded.strip()
     return request.client.host if request.client else "unknown"
 
-def check_rate_limit(ip: str, app_type: str, is_premium: bool = False) -> dict:
-    today = str(date.today())
-    if today not in daily_usage:
-        daily_usage.clear()
-        daily_usage[today] = {}
-    if ip not in daily_usage[today]:
-        daily_usage[today][ip] = {"biz": 0, "proposal": 0, "agency": 0, "bid": 0, "cost": 0}
-    
-    usage = daily_usage[today][ip]
-    current = usage.get(app_type, 0)
-    
-    if app_type in LIMITS:
-        limit = LIMITS[app_type].get("premium" if is_premium else "normal", 10)
-    else:
-        limit = 10
-    
-    remaining = limit - current
-    if remaining <= 0:
-        raise HTTPException(status_code=429, detail=f"일일 사용 한도({limit}회) 초과")
+def check_rate_limit(ip: str, app_type: str, is_premium: bool = False, count: int = 1) -> dict:
+    """일일 한도 확인 후 count건 차감 (일괄 요청은 건수만큼 차감)"""
+    global usage_day
+    today = get_today()
+    key = (today, ip)
+    slot = USAGE_SLOTS.get(app_type, USAGE_DEFAULT_SLOT)
+    
+    pair = LIMITS_PACKED.get(app_type)
+    limit = pair[is_premium] if pair else DEFAULT_LIMIT
+    
+    with daily_usage_lock:
+        if today != usage_day:
+            for stale in [k for k in daily_usage if k[0] != today]:
+                del daily_usage[stale]
+            usage_day = today
+        
+        usage = daily_usage.get(key)
+        if usage is None:
+            usage = daily_usage[key] = [0] * (len(USAGE_SLOTS) + 1)
+            if len(daily_usage) > USAGE_MAX_ENTRIES:
+                daily_usage.popitem(last=False)
+        else:
+            daily_usage.move_to_end(key)
+        
+        current = usage[slot]
+        remaining = limit - current
+        if remaining < count:
+            raise HTTPException(status_code=429, detail=f"일일 사용 한도({limit}회) 초과")
+        
+        usage[slot] = current + count
     
-    usage[app_type] = current + 1
-    return {"used": current + 1, "limit": limit, "remaining": remaining - 1}
+    return {"used": current + count, "limit": limit, "remaining": remaining - count}
 
 # ============================================
 # 요청 모델
@@ -144,10 +258,61 @@ class N2BDecisionRequest(BaseModel):
     company_strength: List[str] = []
     company_weakness: List[str] = []
 
+class CostEstimateBatchRequest(BaseModel):
+    items: List[CostEstimateRequest]
+
+class FullAnalysisItem(BaseModel):
+    bid_no: str
+    base_price: int
+    work_type: str = "기타"
+    material_discount: float = 0
+    labor_discount: float = 0
+    equipment_discount: float = 0
+    min_profit_rate: float = 5.0
+
+class FullAnalysisBatchRequest(BaseModel):
+    items: List[FullAnalysisItem]
+
 class PriceSearchRequest(BaseModel):
     keyword: str
     category: str = "all"
 
+# ============================================
+# 외부 API 응답 캐시 (TTL)
+# ============================================
+API_CACHE_TTL = 300  # 초
+# 키에 사용자 검색어가 들어가므로 항목 수 상한을 두고 가장 오래 안 쓴 항목부터 밀어냄
+API_CACHE_MAX_ENTRIES = 512
+
+api_cache: OrderedDict = OrderedDict()
+api_cache_lock = asyncio.Lock()
+api_cache_stats = {"hits": 0, "misses": 0}
+
+async def cache_get(key: tuple):
+    async with api_cache_lock:
+        entry = api_cache.get(key)
+        if entry is None:
+            api_cache_stats["misses"] += 1
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del api_cache[key]
+            api_cache_stats["misses"] += 1
+            return None
+        api_cache.move_to_end(key)
+        api_cache_stats["hits"] += 1
+        return value
+
+async def cache_set(key: tuple, value, ttl: float = API_CACHE_TTL):
+    # 빈 응답(실패 포함)은 캐시하지 않음
+    if not value:
+        return
+    async with api_cache_lock:
+        api_cache[key] = (time.monotonic() + ttl, value)
+        api_cache.move_to_end(key)
+        while len(api_cache) > API_CACHE_MAX_ENTRIES:
+            api_cache.popitem(last=False)
+
 # ============================================
 # 조달청 가격정보 API
 # ============================================
@@ -162,6 +327,10 @@ async def fetch_material_prices(keyword: str, category: str = "토목") -> list:
     }
     
     endpoint = endpoints.get(category, "getPriceInfoListFcltyCmmnMtrilEngrk")
+    cache_key = ("material", category, keyword.strip().lower())
+    cached = await cache_get(cache_key)
+    if cached is not None:
+        return cached
     
     params = {
         "serviceKey": PUBLIC_DATA_API_KEY,
@@ -172,28 +341,31 @@ async def fetch_material_prices(keyword: str, category: str = "토목") -> list:
     }
     
     try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.get(f"{base_url}/{endpoint}", params=params)
-            
-            if response.status_code == 200:
-                data = response.json()
-                items = data.get("response", {}).get("body", {}).get("items", [])
-                if isinstance(items, dict):
-                    items = items.get("item", [])
-                if isinstance(items, dict):
-                    items = [items]
-                
-                results = []
-                for item in items:
-                    results.append({
-                        "name": item.get("prdctClsfcNoNm", ""),
-                        "spec": item.get("krnPrdctNm", ""),
-                        "unit": item.get("unit", ""),
-                        "price": int(item.get("prce", 0) or 0),
-                        "date": item.get("nticeDt", ""),
-                        "region": item.get("splyJrsdctRgnNm", "전국")
-                    })
-                return results
+        client = app.state.http
+        response = await client.get(f"{base_url}/{endpoint}", params=params)
+        response.raise_for_status()
+        data = orjson.loads(response.content)
+        items = data.get("response", {}).get("body", {}).get("items", [])
+        if isinstance(items, dict):
+            items = items.get("item", [])
+        if isinstance(items, dict):
+            items = [items]
+        
+        results = [
+            {
+                "name": item.get("prdctClsfcNoNm", ""),
+                "spec": item.get("krnPrdctNm", ""),
+                "unit": item.get("unit", ""),
+                "price": int(item.get("prce", 0) or 0),
+                "date": item.get("nticeDt", ""),
+                "region": item.get("splyJrsdctRgnNm", "전국")
+            }
+            for item in items
+        ]
+        await cache_set(cache_key, results)
+        return results
+    except httpx.HTTPStatusError as e:
+        print(f"가격정보 API 오류: HTTP {e.response.status_code}")
     except Exception as e:
         print(f"가격정보 API 오류: {e}")
     
@@ -209,6 +381,10 @@ async def fetch_market_prices(keyword: str, category: str = "토목") -> list:
     }
     
     endpoint = endpoints.get(category, "getPriceInfoListMrktCnstrctPcEngrk")
+    cache_key = ("market", category, keyword.strip().lower())
+    cached = await cache_get(cache_key)
+    if cached is not None:
+        return cached
     
     params = {
         "serviceKey": PUBLIC_DATA_API_KEY,
@@ -219,35 +395,67 @@ async def fetch_market_prices(keyword: str, category: str = "토목") -> list:
     }
     
     try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.get(f"{base_url}/{endpoint}", params=params)
-            if response.status_code == 200:
-                data = response.json()
-                items = data.get("response", {}).get("body", {}).get("items", [])
-                if isinstance(items, dict):
-                    items = items.get("item", [])
-                if isinstance(items, dict):
-                    items = [items]
-                
-                results = []
-                for item in items:
-                    results.append({
-                        "name": item.get("wrkDivNm", ""),
-                        "spec": item.get("wrkDtlDivNm", ""),
-                        "unit": item.get("unt", ""),
-                        "price": int(item.get("mrktPrc", 0)),
-                        "date": item.get("applyDt", ""),
-                        "type": "시공가격"
-                    })
-                return results
+        client = app.state.http
+        response = await client.get(f"{base_url}/{endpoint}", params=params)
+        response.raise_for_status()
+        data = orjson.loads(response.content)
+        items = data.get("response", {}).get("body", {}).get("items", [])
+        if isinstance(items, dict):
+            items = items.get("item", [])
+        if isinstance(items, dict):
+            items = [items]
+        
+        results = [
+            {
+                "name": item.get("wrkDivNm", ""),
+                "spec": item.get("wrkDtlDivNm", ""),
+                "unit": item.get("unt", ""),
+                "price": int(item.get("mrktPrc", 0) or 0),
+                "date": item.get("applyDt", ""),
+                "type": "시공가격"
+            }
+            for item in items
+        ]
+        await cache_set(cache_key, results)
+        return results
+    except httpx.HTTPStatusError as e:
+        print(f"시장시공가격 API 오류: HTTP {e.response.status_code}")
     except Exception as e:
         print(f"시장시공가격 API 오류: {e}")
     
     return []
 
+# ============================================
+# 금액 표시 (천 단위 콤마)
+# ============================================
+@lru_cache(maxsize=1024)
+def format_amount(n: int) -> str:
+    # 같은 금액이 응답 여러 곳/반복 요청에 다시 나오므로 문자열을 캐시
+    return f"{n:,}"
+
 # ============================================
 # 개략원가 산출 로직
 # ============================================
+@dataclass(frozen=True, slots=True)
+class CostBreakdown:
+    material: int
+    labor: int
+    equipment: int
+    direct: int
+    indirect: int
+    total: int
+
+def _to_korean(cb: CostBreakdown) -> dict:
+    """내부 원가 구조 → API 응답용 한글 키 dict"""
+    return {
+        "재료비": cb.material,
+        "노무비": cb.labor,
+        "경비": cb.equipment,
+        "직접공사비": cb.direct,
+        "간접비": cb.indirect,
+        "합계": cb.total
+    }
+
 def calculate_rough_cost(
     base_price: int,
     work_type: str,
@@ -255,95 +463,187 @@ def calculate_rough_cost(
     labor_discount: float = 0,
     equipment_discount: float = 0
 ) -> dict:
-    ratios = COST_RATIOS.get(work_type, COST_RATIOS["기타"])
-    
-    direct_cost_ratio = 0.74
-    estimated_direct_cost = int(base_price * direct_cost_ratio)
-    
-    material_cost = int(estimated_direct_cost * ratios["재료비"] / 100)
-    labor_cost = int(estimated_direct_cost * ratios["노무비"] / 100)
-    equipment_cost = int(estimated_direct_cost * ratios["경비"] / 100)
-    
-    standard_cost = {
-        "재료비": material_cost,
-        "노무비": labor_cost,
-        "경비": equipment_cost,
-        "직접공사비": estimated_direct_cost,
-        "간접비": int(base_price * 0.26),
-        "합계": base_price
-    }
-    
-    actual_material = int(material_cost * (1 - material_discount / 100))
-    actual_labor = int(labor_cost * (1 - labor_discount / 100))
-    actual_equipment = int(equipment_cost * (1 - equipment_discount / 100))
-    actual_direct = actual_material + actual_labor + actual_equipment
-    
-    direct_reduction_rate = actual_direct / estimated_direct_cost if estimated_direct_cost > 0 else 1
-    actual_indirect = int(base_price * 0.26 * direct_reduction_rate)
-    
-    actual_total = actual_direct + actual_indirect
-    
-    actual_cost = {
-        "재료비": actual_material,
-        "노무비": actual_labor,
-        "경비": actual_equipment,
-        "직접공사비": actual_direct,
-        "간접비": actual_indirect,
-        "합계": actual_total
-    }
-    
-    bubble_rate = ((base_price - actual_total) / base_price * 100) if base_price > 0 else 0
-    
-    min_expected_price = int(base_price * 0.97)
-    max_expected_price = int(base_price * 1.03)
-    min_bid_price = int(actual_total * 1.05)
-    
-    recommended_rate = (actual_total / base_price * 100) + 10 if base_price > 0 else 88
-    recommended_rate = min(recommended_rate, 95)
-    recommended_rate = max(recommended_rate, 75)
+    # 절감률은 소수 1자리로 맞춰 거의 같은 입력이 캐시를 빗나가지 않도록 함
+    material_discount = round(material_discount, 1)
+    labor_discount = round(labor_discount, 1)
+    equipment_discount = round(equipment_discount, 1)
+    
+    _, _, _, mp, lp, ep, desc = COST_RATIOS_F.get(work_type, DEFAULT_RATIOS_F)
+    (standard, actual, bubble_rate, min_expected_price, max_expected_price,
+     min_bid_price, recommended_rate, recommended_price) = _rough_cost_cached(
+        base_price, work_type, material_discount, labor_discount, equipment_discount
+    )
     
     return {
         "기초금액": base_price,
         "공종": work_type,
-        "공종설명": ratios["description"],
+        "공종설명": desc,
         "비율": {
-            "재료비": ratios["재료비"],
-            "노무비": ratios["노무비"],
-            "경비": ratios["경비"]
+            "재료비": mp,
+            "노무비": lp,
+            "경비": ep
         },
         "절감률": {
             "재료비": material_discount,
             "노무비": labor_discount,
             "경비": equipment_discount
         },
-        "표준원가": standard_cost,
-        "실제원가": actual_cost,
-        "절감금액": standard_cost["합계"] - actual_cost["합계"],
-        "거품률": round(bubble_rate, 1),
+        "표준원가": _to_korean(standard),
+        "실제원가": _to_korean(actual),
+        "절감금액": standard.total - actual.total,
+        "거품률": bubble_rate,
         "투찰분석": {
             "예정가격범위": {"최저": min_expected_price, "최고": max_expected_price},
             "최저투찰가": min_bid_price,
-            "권장투찰률": round(recommended_rate, 1),
-            "권장투찰가": int(base_price * recommended_rate / 100)
+            "권장투찰률": recommended_rate,
+            "권장투찰가": recommended_price
         }
     }
 
+@lru_cache(maxsize=4096)
+def _rough_cost_cached(
+    base_price: int,
+    work_type: str,
+    material_discount: float,
+    labor_discount: float,
+    equipment_discount: float
+) -> Tuple[CostBreakdown, CostBreakdown, float, int, int, int, float, int]:
+    """수치 결과만 불변 tuple로 반환 (캐시 공유 안전), 응답 dict는 호출 측에서 조립"""
+    mf, lf, ef = COST_RATIOS_F.get(work_type, DEFAULT_RATIOS_F)[:3]
+    
+    # 중간 계산은 float로 유지하고 마지막에만 정수로 변환
+    estimated_direct_cost: float = base_price * DIRECT_COST_RATIO
+    
+    material_cost = base_price * mf
+    labor_cost = base_price * lf
+    equipment_cost = base_price * ef
+    standard_indirect = base_price * INDIRECT_COST_RATIO
+    
+    standard = CostBreakdown(
+        int(material_cost), int(labor_cost), int(equipment_cost),
+        int(estimated_direct_cost), int(standard_indirect), base_price
+    )
+    
+    actual_material = material_cost * (1 - material_discount / 100)
+    actual_labor = labor_cost * (1 - labor_discount / 100)
+    actual_equipment = equipment_cost * (1 - equipment_discount / 100)
+    actual_direct = actual_material + actual_labor + actual_equipment
+    
+    direct_reduction_rate = actual_direct / estimated_direct_cost if estimated_direct_cost > 0 else 1
+    actual_indirect = standard_indirect * direct_reduction_rate
+    
+    # 항목은 각각 절사하고 소계/합계는 절사된 항목의 합으로 (원가표 행 합이 맞도록)
+    # 할인이 0이어도 같은 경로를 거쳐야 표준 원가와 달리 행 합이 맞음
+    parts = (int(actual_material), int(actual_labor), int(actual_equipment))
+    direct = sum(parts)
+    indirect = int(actual_indirect)
+    actual = CostBreakdown(*parts, direct, indirect, direct + indirect)
+    
+    # 비율은 절사된 정수 합계로 계산 (float 오차로 .x5 반올림 방향이 흔들리지 않도록)
+    actual_total: int = actual.total
+    bubble_rate: float = ((base_price - actual_total) / base_price * 100) if base_price > 0 else 0.0
+    
+    min_expected_price = int(base_price * 0.97)
+    max_expected_price = int(base_price * 1.03)
+    min_bid_price = int(actual_total * 1.05)
+    
+    recommended_rate: float = (actual_total / base_price * 100) + 10 if base_price > 0 else 88.0
+    recommended_rate = min(recommended_rate, 95.0)
+    recommended_rate = max(recommended_rate, 75.0)
+    
+    return (
+        standard,
+        actual,
+        round(bubble_rate, 1),
+        min_expected_price,
+        max_expected_price,
+        min_bid_price,
+        round(recommended_rate, 1),
+        int(base_price * recommended_rate / 100)
+    )
+
+def calculate_rough_cost_batch(base_prices: np.ndarray, work_idx: np.ndarray, discounts: np.ndarray) -> dict:
+    """_rough_cost_cached와 같은 산식을 공고 N건에 대해 배열 연산으로 한 번에 계산
+    
+    절감률은 호출 측에서 소수 1자리로 맞춰 넘기고, 반환된 비율의 소수 1자리 반올림도
+    단건과 같은 round()로 호출 측에서 처리 (np.round는 .x5 처리 방식이 달라 결과가 어긋남)
+    """
+    base = base_prices.astype(np.float64)
+    direct = base * DIRECT_COST_RATIO
+    standard_indirect = base * INDIRECT_COST_RATIO
+    
+    costs = base[:, None] * RATIO_TABLE[work_idx]
+    actual = costs * (1 - discounts / 100.0)
+    # 단건과 같은 순서로 더해야 float 결과가 같음
+    actual_direct = actual[:, 0] + actual[:, 1] + actual[:, 2]
+    
+    reduction = np.divide(actual_direct, direct, out=np.ones_like(direct), where=direct > 0)
+    actual_indirect = standard_indirect * reduction
+    
+    # 소계/합계는 절사된 항목의 합 (단건과 동일)
+    actual_int = np.trunc(actual).astype(np.int64)
+    direct_int = actual_int.sum(axis=1)
+    indirect_int = np.trunc(actual_indirect).astype(np.int64)
+    total_int = direct_int + indirect_int
+    
+    # 비율은 절사된 정수 합계로 계산
+    total = total_int.astype(np.float64)
+    valid = base > 0
+    safe_base = np.where(valid, base, 1)
+    bubble_rate = np.where(valid, (base - total) / safe_base * 100, 0.0)
+    recommended_rate = np.where(valid, np.clip(total / safe_base * 100 + 10, 75, 95), 88.0)
+    
+    return {
+        "material": actual_int[:, 0],
+        "labor": actual_int[:, 1],
+        "equipment": actual_int[:, 2],
+        "direct": direct_int,
+        "indirect": indirect_int,
+        "total": total_int,
+        "bubble_rate": bubble_rate,
+        "min_bid_price": np.trunc(total * 1.05).astype(np.int64),
+        "recommended_rate": recommended_rate,
+        "recommended_price": np.trunc(base * recommended_rate / 100).astype(np.int64)
+    }
+
 # ============================================
 # N2B 참여 판정 로직
 # ============================================
-def analyze_n2b_decision(
+# 고정 상수이므로 읽기 전용 mapping + tuple로 보관
+STRENGTH_KEYWORDS = MappingProxyType({
+    "재료": ("거래처", "직거래", "자재", "재료"),
+    "인력": ("직영", "숙련", "인력", "노무"),
+    "장비": ("자가", "장비", "보유")
+})
+WEAKNESS_KEYWORDS = ("미경험", "부족", "없음", "처음")
+
+# 키워드 목록을 정규식 하나로 묶어 문자열당 한 번만 스캔 (긴 키워드 우선)
+STRENGTH_KEYWORD_CATEGORY = {
+    kw: category
+    for category, keywords in STRENGTH_KEYWORDS.items()
+    for kw in keywords
+}
+STRENGTH_PATTERN = re.compile(
+    "|".join(map(re.escape, sorted(STRENGTH_KEYWORD_CATEGORY, key=len, reverse=True)))
+)
+WEAKNESS_PATTERN = re.compile("|".join(map(re.escape, WEAKNESS_KEYWORDS)))
+
+@lru_cache(maxsize=4096)
+def _score_core(
     base_price: int,
     estimated_cost: int,
-    work_type: str,
-    min_profit_rate: float = 10,
-    company_strength: List[str] = [],
-    company_weakness: List[str] = []
-) -> dict:
-    bubble_rate = ((base_price - estimated_cost) / base_price * 100) if base_price > 0 else 0
-    potential_profit = base_price - estimated_cost
-    profit_rate = (potential_profit / estimated_cost * 100) if estimated_cost > 0 else 0
+    min_profit_rate: float,
+    strength_hits: int,
+    weakness_hits: int
+) -> Tuple[int, float, float]:
+    """N2B 점수 산출의 순수 수치 부분 → (점수, 거품률, 수익률)
     
-    score = 50
+    키워드 매칭은 호출 측에서 미리 세어 건수만 넘긴다.
+    """
+    bubble_rate: float = ((base_price - estimated_cost) / base_price * 100) if base_price > 0 else 0.0
+    profit_rate: float = ((base_price - estimated_cost) / estimated_cost * 100) if estimated_cost > 0 else 0.0
+    
+    score: int = 50
     
     if bubble_rate >= 25:
         score += 30
@@ -367,22 +667,31 @@ def analyze_n2b_decision(
     else:
         score -= 10
     
-    strength_keywords = {
-        "재료": ["거래처", "직거래", "자재", "재료"],
-        "인력": ["직영", "숙련", "인력", "노무"],
-        "장비": ["자가", "장비", "보유"]
-    }
+    score += 5 * strength_hits - 5 * weakness_hits
+    score = max(0, min(100, score))
     
-    for strength in company_strength:
-        for category, keywords in strength_keywords.items():
-            if any(kw in strength for kw in keywords):
-                score += 5
+    return score, bubble_rate, profit_rate
+
+def analyze_n2b_decision(
+    base_price: int,
+    estimated_cost: int,
+    work_type: str,
+    min_profit_rate: float = 10,
+    company_strength: List[str] = [],
+    company_weakness: List[str] = []
+) -> dict:
+    potential_profit = base_price - estimated_cost
     
-    for weakness in company_weakness:
-        if any(kw in weakness for kw in ["미경험", "부족", "없음", "처음"]):
-            score -= 5
+    # 강점 하나당 매칭된 카테고리 수만큼 가점
+    strength_hits = sum(
+        len({STRENGTH_KEYWORD_CATEGORY[m.group()] for m in STRENGTH_PATTERN.finditer(strength)})
+        for strength in company_strength
+    )
+    weakness_hits = sum(1 for weakness in company_weakness if WEAKNESS_PATTERN.search(weakness) is not None)
     
-    score = max(0, min(100, score))
+    score, bubble_rate, profit_rate = _score_core(
+        base_price, estimated_cost, min_profit_rate, strength_hits, weakness_hits
+    )
     
     if score >= 75:
         decision = "적극 참여"
@@ -400,9 +709,12 @@ def analyze_n2b_decision(
         decision = "불참 권장"
         recommendation = "수익성 낮음, 불참 권장"
     
+    bp_fmt = format_amount(base_price)
+    ec_fmt = format_amount(estimated_cost)
+    
     n2b = {
-        "not": f"단순히 기초금액 {base_price:,}원이 커서 참여하는 것이 아니다",
-        "but": f"실제원가 {estimated_cost:,}원 대비 거품률 {bubble_rate:.1f}%가 판단 기준이다",
+        "not": f"단순히 기초금액 {bp_fmt}원이 커서 참여하는 것이 아니다",
+        "but": f"실제원가 {ec_fmt}원 대비 거품률 {bubble_rate:.1f}%가 판단 기준이다",
         "because": f"거품률이 {'충분하여' if bubble_rate >= 15 else '부족하여'} 예상수익률 {profit_rate:.1f}%{'로 참여 가치가 있다' if profit_rate >= min_profit_rate else '로 리스크가 있다'}"
     }
     
@@ -440,40 +752,48 @@ def analyze_n2b_decision(
 # ============================================
 # API 엔드포인트
 # ============================================
+# 변하지 않는 응답은 모듈 로드 시 한 번만 만들어 둠
+ROOT_RESPONSE = {
+    "service": "wise-bid API v4.0",
+    "features": [
+        "가격정보 API 연동",
+        "공종별 비율 DB",
+        "개략원가 자동 산출",
+        "N2B 참여 판정",
+        "입찰공고 조회/매칭",
+        "회사 프로필 매칭",
+        "낙찰률 조회 API - 공사/용역/물품 (NEW!)"
+    ],
+    "endpoints": {
+        "/api/cost-ratios": "공종별 비율 조회",
+        "/api/price-search": "자재/시공 단가 검색",
+        "/api/cost-estimate": "개략원가 산출",
+        "/api/cost-estimate-batch": "개략원가 일괄 산출",
+        "/api/n2b-decision": "N2B 참여 판정",
+        "/api/full-analysis/batch": "통합 분석 일괄 처리",
+        "/api/quick-match/{profile}": "샘플 프로필 매칭",
+        "/api/custom-match": "커스텀 조건 매칭",
+        "/api/bid-rate": "낙찰률 조회 (NEW!)",
+        "/api/bid-rate/summary": "전체 공종별 낙찰률 요약 (NEW!)",
+        "/api/cache-stats": "외부 API 캐시 현황",
+        "/api/debug/bid-api": "입찰공고 API 테스트",
+        "/api/debug/price-api": "가격정보 API 테스트",
+        "/api/debug/bid-result-api": "낙찰정보 API 테스트 (NEW!)"
+    }
+}
+
+COST_RATIOS_RESPONSE = {
+    "공종별비율": COST_RATIOS,
+    "간접비비율": INDIRECT_RATIOS
+}
+
 @app.get("/")
 async def root():
-    return {
-        "service": "wise-bid API v4.0",
-        "features": [
-            "가격정보 API 연동",
-            "공종별 비율 DB",
-            "개략원가 자동 산출",
-            "N2B 참여 판정",
-            "입찰공고 조회/매칭",
-            "회사 프로필 매칭",
-            "낙찰률 조회 API - 공사/용역/물품 (NEW!)"
-        ],
-        "endpoints": {
-            "/api/cost-ratios": "공종별 비율 조회",
-            "/api/price-search": "자재/시공 단가 검색",
-            "/api/cost-estimate": "개략원가 산출",
-            "/api/n2b-decision": "N2B 참여 판정",
-            "/api/quick-match/{profile}": "샘플 프로필 매칭",
-            "/api/custom-match": "커스텀 조건 매칭",
-            "/api/bid-rate": "낙찰률 조회 (NEW!)",
-            "/api/bid-rate/summary": "전체 공종별 낙찰률 요약 (NEW!)",
-            "/api/debug/bid-api": "입찰공고 API 테스트",
-            "/api/debug/price-api": "가격정보 API 테스트",
-            "/api/debug/bid-result-api": "낙찰정보 API 테스트 (NEW!)"
-        }
-    }
+    return ROOT_RESPONSE
 
 @app.get("/api/cost-ratios")
 async def get_cost_ratios():
-    return {
-        "공종별비율": COST_RATIOS,
-        "간접비비율": INDIRECT_RATIOS
-    }
+    return COST_RATIOS_RESPONSE
 
 @app.get("/api/cost-ratio/{work_type}")
 async def get_cost_ratio(work_type: str):
@@ -487,8 +807,15 @@ async def search_prices(req: PriceSearchRequest, request: Request):
     is_premium = request.headers.get("x-premium-key") == PREMIUM_KEY
     check_rate_limit(ip, "cost", is_premium)
     
-    material_prices = await fetch_material_prices(req.keyword, "토목")
-    market_prices = await fetch_market_prices(req.keyword, "토목")
+    material_prices, market_prices = await asyncio.gather(
+        fetch_material_prices(req.keyword, "토목"),
+        fetch_market_prices(req.keyword, "토목"),
+        return_exceptions=True
+    )
+    if isinstance(material_prices, BaseException):
+        material_prices = []
+    if isinstance(market_prices, BaseException):
+        market_prices = []
     
     return {
         "keyword": req.keyword,
@@ -498,7 +825,7 @@ async def search_prices(req: PriceSearchRequest, request: Request):
     }
 
 @app.post("/api/cost-estimate")
-async def estimate_cost(req: CostEstimateRequest, request: Request):
+def estimate_cost(req: CostEstimateRequest, request: Request):
     ip = get_client_ip(request)
     is_premium = request.headers.get("x-premium-key") == PREMIUM_KEY
     check_rate_limit(ip, "cost", is_premium)
@@ -513,8 +840,84 @@ async def estimate_cost(req: CostEstimateRequest, request: Request):
     
     return result
 
+MAX_BATCH_ITEMS = 1000
+MAX_BATCH_BASE_PRICE = 10 ** 15  # 배열(int64) 변환 범위 안으로 제한
+
+def validate_batch_items(items: list, rate_fields: tuple) -> None:
+    """일괄 요청 항목의 금액/비율 범위 확인 (NaN/inf 포함 범위 밖이면 400)"""
+    for i, it in enumerate(items):
+        if abs(it.base_price) > MAX_BATCH_BASE_PRICE:
+            raise HTTPException(status_code=400, detail=f"{i}번 항목: 기초금액 범위 초과")
+        for field in rate_fields:
+            if not 0 <= getattr(it, field) <= 100:
+                raise HTTPException(status_code=400, detail=f"{i}번 항목: {field}는 0~100 사이여야 합니다")
+
+@app.post("/api/cost-estimate-batch")
+def estimate_cost_batch(req: CostEstimateBatchRequest, request: Request):
+    ip = get_client_ip(request)
+    is_premium = request.headers.get("x-premium-key") == PREMIUM_KEY
+    
+    if len(req.items) > MAX_BATCH_ITEMS:
+        raise HTTPException(status_code=400, detail=f"한 번에 최대 {MAX_BATCH_ITEMS}건까지 산출 가능")
+    validate_batch_items(req.items, ("material_discount", "labor_discount", "equipment_discount"))
+    
+    if not req.items:
+        return {"count": 0, "results": []}
+    
+    # 일괄 산출도 건수만큼 한도 차감
+    check_rate_limit(ip, "cost", is_premium, count=len(req.items))
+    
+    base_prices = np.array([it.base_price for it in req.items], dtype=np.int64)
+    work_idx = np.array([WORK_TYPE_INDEX.get(it.work_type, DEFAULT_WORK_TYPE_INDEX) for it in req.items], dtype=np.intp)
+    # 단건 산출과 같이 절감률을 소수 1자리로 맞춤
+    discounts = np.array(
+        [[round(it.material_discount, 1), round(it.labor_discount, 1), round(it.equipment_discount, 1)]
+         for it in req.items],
+        dtype=np.float64
+    )
+    
+    batch = calculate_rough_cost_batch(base_prices, work_idx, discounts)
+    
+    # 배열 → 파이썬 리스트는 열 단위로 한 번씩만 변환
+    columns = zip(
+        batch["material"].tolist(),
+        batch["labor"].tolist(),
+        batch["equipment"].tolist(),
+        batch["direct"].tolist(),
+        batch["indirect"].tolist(),
+        batch["total"].tolist(),
+        batch["bubble_rate"].tolist(),
+        batch["min_bid_price"].tolist(),
+        batch["recommended_rate"].tolist(),
+        batch["recommended_price"].tolist()
+    )
+    
+    results = [
+        {
+            "기초금액": it.base_price,
+            "공종": it.work_type,
+            "실제원가": {
+                "재료비": material,
+                "노무비": labor,
+                "경비": equipment,
+                "직접공사비": direct,
+                "간접비": indirect,
+                "합계": total
+            },
+            "절감금액": it.base_price - total,
+            "거품률": round(bubble_rate, 1),
+            "최저투찰가": min_bid_price,
+            "권장투찰률": round(recommended_rate, 1),
+            "권장투찰가": recommended_price
+        }
+        for it, (material, labor, equipment, direct, indirect, total,
+                 bubble_rate, min_bid_price, recommended_rate, recommended_price) in zip(req.items, columns)
+    ]
+    
+    return {"count": len(results), "results": results}
+
 @app.post("/api/n2b-decision")
-async def n2b_decision(req: N2BDecisionRequest, request: Request):
+def n2b_decision(req: N2BDecisionRequest, request: Request):
     ip = get_client_ip(request)
     is_premium = request.headers.get("x-premium-key") == PREMIUM_KEY
     check_rate_limit(ip, "cost", is_premium)
@@ -565,16 +968,23 @@ async def quick_decision(
 # ============================================
 # 통합 분석 엔드포인트 (GET)
 # ============================================
-@app.get("/api/full-analysis")
-async def full_analysis(
+# ETag는 직렬화된 응답 본문의 해시 → 산식이 바뀌면 ETag도 바뀌어 이전 결과가 재사용되지 않음
+FULL_ANALYSIS_MAX_AGE = 60
+
+@app.get("/api/full-analysis", response_model=None)
+def full_analysis(
+    request: Request,
     base_price: int,
     work_type: str = "기타",
     material_discount: float = 10,
     labor_discount: float = 15,
     equipment_discount: float = 10,
     min_profit_rate: float = 10,
-    request: Request = None
-):
+    bid_name: str = ""
+) -> Response:
+    if work_type == "기타" and bid_name:
+        work_type = infer_work_type(bid_name)
+    
     cost_result = calculate_rough_cost(
         base_price=base_price,
         work_type=work_type,
@@ -603,10 +1013,13 @@ async def full_analysis(
     else:
         strategy = "신중 투찰: 원가 재검토 필요"
     
-    return {
+    bp_fmt = format_amount(base_price)
+    ec_fmt = format_amount(estimated_cost)
+    
+    body = orjson.dumps({
         "summary": {
-            "기초금액": f"{base_price:,}원",
-            "예상원가": f"{estimated_cost:,}원",
+            "기초금액": f"{bp_fmt}원",
+            "예상원가": f"{ec_fmt}원",
             "거품률": f"{bubble_rate}%",
             "판정": decision_result["decision"],
             "점수": f"{decision_result['score']}점",
@@ -615,27 +1028,52 @@ async def full_analysis(
         "원가분석": cost_result,
         "참여판정": decision_result,
         "n2b": decision_result["n2b"]
-    }
+    })
+    
+    etag = '"' + hashlib.blake2b(body, digest_size=8).hexdigest() + '"'
+    cache_headers = {"ETag": etag, "Cache-Control": f"public, max-age={FULL_ANALYSIS_MAX_AGE}"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=cache_headers)
+    return Response(content=body, media_type="application/json", headers=cache_headers)
 
 @app.get("/api/usage")
 async def get_usage(request: Request):
     ip = get_client_ip(request)
-    today = str(date.today())
+    today = get_today()
     is_premium = request.headers.get("x-premium-key") == PREMIUM_KEY
-    usage = daily_usage.get(today, {}).get(ip, {"cost": 0, "bid": 0})
+    usage = daily_usage.get((today, ip))
+    used = usage[USAGE_SLOTS["cost"]] if usage else 0
     
     cost_limit = LIMITS["cost"]["premium"] if is_premium else LIMITS["cost"]["normal"]
     
     return {
         "date": today,
         "cost": {
-            "used": usage.get("cost", 0),
+            "used": used,
             "limit": cost_limit,
-            "remaining": cost_limit - usage.get("cost", 0),
+            "remaining": cost_limit - used,
             "tier": "premium" if is_premium else "normal"
         }
     }
 
+@app.get("/api/cache-stats")
+async def get_cache_stats():
+    now = time.monotonic()
+    live = sum(1 for expires_at, _ in api_cache.values() if expires_at > now)
+    total = api_cache_stats["hits"] + api_cache_stats["misses"]
+    return {
+        "entries": len(api_cache),
+        "live_entries": live,
+        "max_entries": API_CACHE_MAX_ENTRIES,
+        "ttl_seconds": API_CACHE_TTL,
+        "hits": api_cache_stats["hits"],
+        "misses": api_cache_stats["misses"],
+        "hit_rate": round(api_cache_stats["hits"] / total * 100, 1) if total else 0,
+        "rough_cost": _rough_cost_cached.cache_info()._asdict(),
+        "n2b_score": _score_core.cache_info()._asdict(),
+        "full_analysis": _full_analysis_core.cache_info()._asdict()
+    }
+
 # ============================================
 # 입찰공고 조회 (나라장터 API)
 # ============================================
@@ -650,6 +1088,11 @@ async def fetch_bid_announcements(keyword: str, bid_type: str = "공사", count:
     endpoint = type_endpoints.get(bid_type, "getBidPblancListInfoCnstwk")
     url = f"https://apis.data.go.kr/1230000/ad/BidPublicInfoService/{endpoint}"
     
+    cache_key = ("bid", bid_type, (keyword or "").strip(), count)
+    cached = await cache_get(cache_key)
+    if cached is not None:
+        return cached
+    
     end_date = datetime.now()
     start_date = end_date - timedelta(days=7)
     
@@ -667,46 +1110,47 @@ async def fetch_bid_announcements(keyword: str, bid_type: str = "공사", count:
         params["bidNm"] = keyword
 
     try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.get(url, params=params)
-            
-            response.raise_for_status()
-            data = response.json()
-            
-            response_data = data.get("response", {})
-            body = response_data.get("body", {})
-            items = body.get("items", [])
-            
-            if isinstance(items, dict):
-                items = items.get("item", [])
-            if not isinstance(items, list):
-                items = [items] if items else []
-            
-            if not items:
-                return []
-            
-            bids = []
-            for item in items:
-                bid = {
-                    "bid_no": item.get("bidNtceNo", ""),
-                    "bid_name": item.get("bidNtceNm", ""),
-                    "agency": item.get("ntceInsttNm", ""),
-                    "demand_agency": item.get("dminsttNm", ""),
-                    "estimated_price": item.get("presmptPrce", 0),
-                    "base_price": item.get("asignBdgtAmt", 0),
-                    "bid_method": item.get("bidMethdNm", ""),
-                    "contract_method": item.get("cntrctCnclsMthdNm", ""),
-                    "deadline": item.get("bidClseDt", ""),
-                    "open_date": item.get("opengDt", ""),
-                    "region": item.get("ntceInsttOfclAddr", ""),
-                    "url": item.get("bidNtceDtlUrl", ""),
-                    "bid_type": bid_type,
-                    "main_cnstty": item.get("mainCnsttyNm", ""),
-                    "cnstty_list": item.get("cnsttyAccotShreRateList", "")
-                }
-                bids.append(bid)
-            
-            return bids
+        client = app.state.http
+        response = await client.get(url, params=params)
+
+        response.raise_for_status()
+        data = orjson.loads(response.content)
+
+        response_data = data.get("response", {})
+        body = response_data.get("body", {})
+        items = body.get("items", [])
+
+        if isinstance(items, dict):
+            items = items.get("item", [])
+        if not isinstance(items, list):
+            items = [items] if items else []
+
+        if not items:
+            return []
+
+        bids = [
+            {
+                "bid_no": item.get("bidNtceNo", ""),
+                "bid_name": item.get("bidNtceNm", ""),
+                "agency": item.get("ntceInsttNm", ""),
+                "demand_agency": item.get("dminsttNm", ""),
+                "estimated_price": item.get("presmptPrce", 0),
+                "base_price": item.get("asignBdgtAmt", 0),
+                "bid_method": item.get("bidMethdNm", ""),
+                "contract_method": item.get("cntrctCnclsMthdNm", ""),
+                "deadline": item.get("bidClseDt", ""),
+                "open_date": item.get("opengDt", ""),
+                "region": item.get("ntceInsttOfclAddr", ""),
+                "url": item.get("bidNtceDtlUrl", ""),
+                "bid_type": bid_type,
+                "main_cnstty": item.get("mainCnsttyNm", ""),
+                "cnstty_list": item.get("cnsttyAccotShreRateList", "")
+            }
+            for item in items
+        ]
+
+        await cache_set(cache_key, bids)
+        return bids
     except Exception as e:
         print(f"[조달청 입찰공고 오류] {e}")
         import traceback
@@ -727,6 +1171,11 @@ async def fetch_winning_bids(keyword: str, bid_type: str = "공사", count: int
     endpoint = type_endpoints.get(bid_type, "getOpengResultListInfoCnstwkPPSSrch")
     url = f"https://apis.data.go.kr/1230000/ScsbidInfoService/{endpoint}"
     
+    cache_key = ("winning", bid_type, (keyword or "").strip(), count)
+    cached = await cache_get(cache_key)
+    if cached is not None:
+        return cached
+    
     params = {
         "ServiceKey": PUBLIC_DATA_API_KEY,
         "pageNo": 1,
@@ -737,39 +1186,40 @@ async def fetch_winning_bids(keyword: str, bid_type: str = "공사", count: int
     }
 
     try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.get(url, params=params)
-            response.raise_for_status()
-            data = response.json()
-            items = data.get("response", {}).get("body", {}).get("items", [])
-            if not items:
-                return []
-            # items가 dict일 수 있음
-            if isinstance(items, dict):
-                items = items.get("item", [])
-            if isinstance(items, dict):
-                items = [items]
-            if not isinstance(items, list):
-                items = []
-            
-            results = []
-            for item in items:
-                estimated = float(item.get("presmptPrce", 0) or 0)
-                winning = float(item.get("sucsfbidAmt", 0) or 0)
-                rate = (winning / estimated * 100) if estimated > 0 else 0
-                result = {
-                    "bid_no": item.get("bidNtceNo", ""),
-                    "bid_name": item.get("bidNtceNm", ""),
-                    "agency": item.get("ntceInsttNm", ""),
-                    "estimated_price": estimated,
-                    "winning_price": winning,
-                    "winning_rate": round(rate, 2),
-                    "winner": item.get("sucsfbidCorpNm", ""),
-                    "open_date": item.get("opengDt", ""),
-                    "participant_count": item.get("prtcptCnum", 0)
-                }
-                results.append(result)
-            return results
+        client = app.state.http
+        response = await client.get(url, params=params)
+        response.raise_for_status()
+        data = orjson.loads(response.content)
+        items = data.get("response", {}).get("body", {}).get("items", [])
+        if not items:
+            return []
+        # items가 dict일 수 있음
+        if isinstance(items, dict):
+            items = items.get("item", [])
+        if isinstance(items, dict):
+            items = [items]
+        if not isinstance(items, list):
+            items = []
+
+        results = []
+        for item in items:
+            estimated = float(item.get("presmptPrce", 0) or 0)
+            winning = float(item.get("sucsfbidAmt", 0) or 0)
+            rate = (winning / estimated * 100) if estimated > 0 else 0
+            result = {
+                "bid_no": item.get("bidNtceNo", ""),
+                "bid_name": item.get("bidNtceNm", ""),
+                "agency": item.get("ntceInsttNm", ""),
+                "estimated_price": estimated,
+                "winning_price": winning,
+                "winning_rate": round(rate, 2),
+                "winner": item.get("sucsfbidCorpNm", ""),
+                "open_date": item.get("opengDt", ""),
+                "participant_count": item.get("prtcptCnum", 0)
+            }
+            results.append(result)
+        await cache_set(cache_key, results)
+        return results
     except Exception as e:
         print(f"[조달청 낙찰정보 오류] {e}")
         return []
@@ -823,36 +1273,43 @@ SAMPLE_PROFILES = {
     )
 }
 
-@app.get("/api/sample-profiles")
-async def get_sample_profiles():
-    return {
-        "success": True,
-        "profiles": {
-            name: {
-                "company_name": profile.company_name,
-                "business_type": profile.business_type,
-                "work_types": profile.work_types,
-                "regions": profile.regions,
-                "min_price": profile.min_price,
-                "max_price": profile.max_price,
-                "min_price_formatted": f"{profile.min_price:,}원",
-                "max_price_formatted": f"{profile.max_price:,}원",
-                "licenses": profile.licenses,
-                "experiences": profile.experiences
-            }
-            for name, profile in SAMPLE_PROFILES.items()
+def compile_terms(terms: List[str]) -> Optional[re.Pattern]:
+    """공종/지역 목록을 정규식 하나로 묶음 (공고명 한 번 스캔으로 매칭)"""
+    terms = [t for t in terms if t]
+    if not terms:
+        return None
+    return re.compile("|".join(map(re.escape, terms)))
+
+# 샘플 프로필은 고정이므로 매칭 패턴을 미리 만들어 둠
+SAMPLE_PROFILE_PATTERNS = {
+    name: (compile_terms(profile.work_types), compile_terms(profile.regions))
+    for name, profile in SAMPLE_PROFILES.items()
+}
+
+# 샘플 프로필 조회 응답도 고정값이므로 미리 생성
+SAMPLE_PROFILES_RESPONSE = {
+    "success": True,
+    "profiles": {
+        name: {
+            "company_name": profile.company_name,
+            "business_type": profile.business_type,
+            "work_types": profile.work_types,
+            "regions": profile.regions,
+            "min_price": profile.min_price,
+            "max_price": profile.max_price,
+            "min_price_formatted": f"{profile.min_price:,}원",
+            "max_price_formatted": f"{profile.max_price:,}원",
+            "licenses": profile.licenses,
+            "experiences": profile.experiences
         }
+        for name, profile in SAMPLE_PROFILES.items()
     }
+}
 
-@app.get("/api/sample-profiles/{profile_name}")
-async def get_sample_profile(profile_name: str):
-    if profile_name not in SAMPLE_PROFILES:
-        raise HTTPException(status_code=404, detail=f"프로필 '{profile_name}' 없음")
-    
-    profile = SAMPLE_PROFILES[profile_name]
-    return {
+SAMPLE_PROFILE_RESPONSES = {
+    name: {
         "success": True,
-        "name": profile_name,
+        "name": name,
         "profile": {
             "company_name": profile.company_name,
             "business_type": profile.business_type,
@@ -864,6 +1321,19 @@ async def get_sample_profile(profile_name: str):
             "experiences": profile.experiences
         }
     }
+    for name, profile in SAMPLE_PROFILES.items()
+}
+
+@app.get("/api/sample-profiles")
+async def get_sample_profiles():
+    return SAMPLE_PROFILES_RESPONSE
+
+@app.get("/api/sample-profiles/{profile_name}")
+async def get_sample_profile(profile_name: str):
+    if profile_name not in SAMPLE_PROFILE_RESPONSES:
+        raise HTTPException(status_code=404, detail=f"프로필 '{profile_name}' 없음")
+    
+    return SAMPLE_PROFILE_RESPONSES[profile_name]
 
 # ============================================
 # 커스텀 프로필로 공고 매칭
@@ -898,6 +1368,9 @@ async def custom_match(req: CustomMatchRequest):
     
     bids = await fetch_bid_announcements(search_keyword, req.bid_type, 100)
     
+    work_pattern = compile_terms(req.work_types)
+    region_pattern = compile_terms(expanded_regions)
+    
     today = datetime.now()
     
     matched = []
@@ -931,40 +1404,27 @@ async def custom_match(req: CustomMatchRequest):
         cnstty_list = bid.get("cnstty_list", "")
         search_text = f"{bid_name} {main_cnstty} {cnstty_list}"
         
-        work_type_matched = False
-        matched_work_type = ""
-        for work_type in req.work_types:
-            if work_type in search_text:
-                score += 25
-                matched_work_type = work_type
-                work_type_matched = True
-                break
-        
-        if work_type_matched:
-            reasons.append(f"공종: {matched_work_type}" + (f" ({main_cnstty})" if main_cnstty else ""))
-        
-        if not work_type_matched:
+        work_match = work_pattern.search(search_text) if work_pattern else None
+        if work_match is None:
             continue
         
+        score += 25
+        matched_work_type = work_match.group()
+        reasons.append(f"공종: {matched_work_type}" + (f" ({main_cnstty})" if main_cnstty else ""))
+        
         region = bid.get("region", "") or bid.get("agency", "")
-        region_matched = False
         if "전국" in expanded_regions:
-            region_matched = True
             score += 20
             reasons.append("지역: 전국")
         else:
-            for r in expanded_regions:
-                if r in region:
-                    score += 20
-                    reasons.append(f"지역: {r}")
-                    region_matched = True
-                    break
-        
-        bid["match_score"] = score
-        bid["match_reasons"] = reasons
+            region_match = region_pattern.search(region) if region_pattern else None
+            if region_match is not None:
+                score += 20
+                reasons.append(f"지역: {region_match.group()}")
         
+        # 캐시된 공고 dict는 공유되므로 복사본에 매칭 결과를 붙임
         if score >= 25:
-            matched.append(bid)
+            matched.append({**bid, "match_score": score, "match_reasons": reasons})
     
     matched.sort(key=lambda x: (x.get("deadline", "9999"), -x.get("match_score", 0)))
     
@@ -998,6 +1458,8 @@ async def quick_match(profile_name: str, keyword: str = "", bid_type: str = "공
     
     bids = await fetch_bid_announcements(search_keyword, bid_type, 100)
     
+    work_pattern, region_pattern = SAMPLE_PROFILE_PATTERNS[profile_name]
+    
     today = datetime.now()
     
     matched = []
@@ -1031,33 +1493,23 @@ async def quick_match(profile_name: str, keyword: str = "", bid_type: str = "공
         cnstty_list = bid.get("cnstty_list", "")
         search_text = f"{bid_name} {main_cnstty} {cnstty_list}"
         
-        work_type_matched = False
-        matched_work_type = ""
-        for work_type in profile.work_types:
-            if work_type in search_text:
-                score += 25
-                matched_work_type = work_type
-                work_type_matched = True
-                break
-        
-        if work_type_matched:
-            reasons.append(f"공종: {matched_work_type} ({main_cnstty})" if main_cnstty else f"공종: {matched_work_type}")
-        
-        if not work_type_matched:
+        work_match = work_pattern.search(search_text) if work_pattern else None
+        if work_match is None:
             continue
         
-        region = bid.get("region", "") or bid.get("agency", "")
-        for r in profile.regions:
-            if r in region:
-                score += 20
-                reasons.append(f"지역: {r}")
-                break
+        score += 25
+        matched_work_type = work_match.group()
+        reasons.append(f"공종: {matched_work_type} ({main_cnstty})" if main_cnstty else f"공종: {matched_work_type}")
         
-        bid["match_score"] = score
-        bid["match_reasons"] = reasons
+        region = bid.get("region", "") or bid.get("agency", "")
+        region_match = region_pattern.search(region) if region_pattern else None
+        if region_match is not None:
+            score += 20
+            reasons.append(f"지역: {region_match.group()}")
         
+        # 캐시된 공고 dict는 공유되므로 복사본에 매칭 결과를 붙임
         if score >= 25:
-            matched.append(bid)
+            matched.append({**bid, "match_score": score, "match_reasons": reasons})
     
     matched.sort(key=lambda x: (x.get("deadline", "9999"), -x.get("match_score", 0)))
     
@@ -1145,6 +1597,9 @@ async def match_bids(req: BidSearchRequest, request: Request):
             "message": "프로필 없음 - 전체 공고 반환"
         }
     
+    work_pattern = compile_terms(req.profile.work_types)
+    region_pattern = compile_terms(req.profile.regions)
+    
     today = datetime.now()
     
     matched = []
@@ -1178,33 +1633,23 @@ async def match_bids(req: BidSearchRequest, request: Request):
         cnstty_list = bid.get("cnstty_list", "")
         search_text = f"{bid_name} {main_cnstty} {cnstty_list}"
         
-        work_type_matched = False
-        matched_work_type = ""
-        for work_type in req.profile.work_types:
-            if work_type in search_text:
-                score += 25
-                matched_work_type = work_type
-                work_type_matched = True
-                break
-        
-        if work_type_matched:
-            reasons.append(f"공종: {matched_work_type} ({main_cnstty})" if main_cnstty else f"공종: {matched_work_type}")
-        
-        if not work_type_matched:
+        work_match = work_pattern.search(search_text) if work_pattern else None
+        if work_match is None:
             continue
         
-        region = bid.get("region", "") or bid.get("agency", "")
-        for r in req.profile.regions:
-            if r in region:
-                score += 20
-                reasons.append(f"지역 매칭: {r}")
-                break
+        score += 25
+        matched_work_type = work_match.group()
+        reasons.append(f"공종: {matched_work_type} ({main_cnstty})" if main_cnstty else f"공종: {matched_work_type}")
         
-        bid["match_score"] = score
-        bid["match_reasons"] = reasons
+        region = bid.get("region", "") or bid.get("agency", "")
+        region_match = region_pattern.search(region) if region_pattern else None
+        if region_match is not None:
+            score += 20
+            reasons.append(f"지역 매칭: {region_match.group()}")
         
+        # 캐시된 공고 dict는 공유되므로 복사본에 매칭 결과를 붙임
         if score >= 25:
-            matched.append(bid)
+            matched.append({**bid, "match_score": score, "match_reasons": reasons})
     
     matched.sort(key=lambda x: (x.get("deadline", "9999"), -x.get("match_score", 0)))
     
@@ -1241,16 +1686,29 @@ async def get_winning_rate(
             "data": []
         }
     
-    rates = [r["winning_rate"] for r in results if r["winning_rate"] > 0]
-    avg_rate = sum(rates) / len(rates) if rates else 87.5
+    # 평균/최저/최고를 한 번의 순회로 계산
+    total = 0.0
+    n = 0
+    min_rate = max_rate = 0
+    for r in results:
+        rate = r["winning_rate"]
+        if rate <= 0:
+            continue
+        if n == 0 or rate < min_rate:
+            min_rate = rate
+        if n == 0 or rate > max_rate:
+            max_rate = rate
+        total += rate
+        n += 1
+    avg_rate = total / n if n else 87.5
     
     return {
         "success": True,
         "keyword": keyword,
         "count": len(results),
         "avg_rate": round(avg_rate, 2),
-        "min_rate": round(min(rates), 2) if rates else 0,
-        "max_rate": round(max(rates), 2) if rates else 0,
+        "min_rate": round(min_rate, 2),
+        "max_rate": round(max_rate, 2),
         "recommendation": f"투찰가율 {avg_rate - 0.5:.1f}% ~ {avg_rate + 0.5:.1f}% 권장",
         "data": results[:10]
     }
@@ -1258,68 +1716,187 @@ async def get_winning_rate(
 # ============================================
 # 통합 분석 API (POST - 공고 + 원가 + N2B)
 # ============================================
-@app.post("/api/full-analysis")
-async def full_analysis_post(
-    bid_no: str,
+# 거품률 구간 경계 (이상) → 구간별 (판정, 점수, 적합도 문구, 절감 여력 문구)
+# 적합도는 10% 이상, 절감 여력은 15% 이상에서 바뀌므로 구간에 함께 담아 둠
+FULL_ANALYSIS_THRESHOLDS = (5, 10, 15, 20)
+FULL_ANALYSIS_DECISIONS = (
+    ("참여 불가", 30, "신중 검토", "제한적"),
+    ("신중 검토", 55, "신중 검토", "제한적"),
+    ("조건부 참여", 70, "참여 적합", "제한적"),
+    ("참여 권장", 85, "참여 적합", "충분"),
+    ("적극 참여", 95, "참여 적합", "충분")
+)
+FULL_ANALYSIS_THRESHOLDS_ARR = np.array(FULL_ANALYSIS_THRESHOLDS, dtype=np.float64)
+
+@dataclass(frozen=True, slots=True)
+class FullAnalysis:
+    direct: int
+    indirect: int
+    total: int
+    bubble_rate: float
+    band: int
+    recommend_rate: float
+    recommend_price: int
+    expected_profit: int
+    profit_rate: float
+
+@lru_cache(maxsize=4096)
+def _full_analysis_core(
     base_price: int,
-    work_type: str = "기타",
-    material_discount: float = 0,
-    labor_discount: float = 0,
-    equipment_discount: float = 0,
-    min_profit_rate: float = 5.0,
-    request: Request = None
-):
-    ratios = COST_RATIOS.get(work_type, COST_RATIOS["기타"])
+    work_type: str,
+    material_discount: float,
+    labor_discount: float,
+    equipment_discount: float,
+    min_profit_rate: float
+) -> FullAnalysis:
+    """통합 분석의 순수 수치 부분 (불변 객체라 캐시 공유 안전), 응답 dict는 호출 측에서 조립
+    
+    소수 1자리 반올림은 round() 대신 10배 스케일 후 내림으로 처리 (.x5는 올림)
+    """
+    mf, lf, ef = COST_RATIOS_F.get(work_type, DEFAULT_RATIOS_F)[:3]
+    
+    # 항목별 금액은 응답에 없으므로 절감 반영 승수를 합쳐 직접공사비를 한 번에 계산
+    direct_factor: float = (
+        mf * (1 - material_discount / 100)
+        + lf * (1 - labor_discount / 100)
+        + ef * (1 - equipment_discount / 100)
+    )
+    actual_direct: int = int(base_price * direct_factor)
     
-    direct_cost = int(base_price * 0.74)
-    material = int(direct_cost * ratios["재료비"] / 100)
-    labor = int(direct_cost * ratios["노무비"] / 100)
-    equipment = int(direct_cost * ratios["경비"] / 100)
+    indirect: int = int(actual_direct * INDIRECT_PER_DIRECT)
+    actual_total: int = actual_direct + indirect
     
-    actual_material = int(material * (1 - material_discount / 100))
-    actual_labor = int(labor * (1 - labor_discount / 100))
-    actual_equipment = int(equipment * (1 - equipment_discount / 100))
-    actual_direct = actual_material + actual_labor + actual_equipment
+    bubble_rate: float = ((1 - actual_total / base_price) * 1000 + 0.5) // 1 / 10
+    
+    # bisect_right: 경계값과 같으면 윗 구간 (>= 비교와 동일)
+    band: int = bisect_right(FULL_ANALYSIS_THRESHOLDS, bubble_rate)
+    
+    recommend_rate: float = ((100 - bubble_rate + min_profit_rate) * 10 + 0.5) // 1 / 10
+    recommend_price: int = int(base_price * recommend_rate / 100)
+    expected_profit: int = recommend_price - actual_total
+    profit_rate: float = (expected_profit / recommend_price * 1000 + 0.5) // 1 / 10
+    
+    return FullAnalysis(
+        actual_direct, indirect, actual_total, bubble_rate, band,
+        recommend_rate, recommend_price, expected_profit, profit_rate
+    )
+
+def full_analysis_batch(
+    base_prices: np.ndarray,
+    work_idx: np.ndarray,
+    discounts: np.ndarray,
+    min_profit_rates: np.ndarray
+) -> dict:
+    """_full_analysis_core와 같은 산식(정수 절사/반올림 포함)을 N건에 대해 배열 연산으로 계산"""
+    base = base_prices.astype(np.float64)
     
-    indirect = int(actual_direct * 0.26 / 0.74)
+    direct_factor = (RATIO_TABLE[work_idx] * (1 - discounts / 100.0)).sum(axis=1)
+    actual_direct = np.trunc(base * direct_factor)
+    
+    indirect = np.trunc(actual_direct * INDIRECT_PER_DIRECT)
     actual_total = actual_direct + indirect
     
-    bubble_rate = round((1 - actual_total / base_price) * 100, 1)
+    bubble_rate = np.floor((1 - actual_total / base) * 1000 + 0.5) / 10
+    band = np.searchsorted(FULL_ANALYSIS_THRESHOLDS_ARR, bubble_rate, side="right")
     
-    if bubble_rate >= 20:
-        decision = "적극 참여"
-        score = 95
-    elif bubble_rate >= 15:
-        decision = "참여 권장"
-        score = 85
-    elif bubble_rate >= 10:
-        decision = "조건부 참여"
-        score = 70
-    elif bubble_rate >= 5:
-        decision = "신중 검토"
-        score = 55
-    else:
-        decision = "참여 불가"
-        score = 30
+    recommend_rate = np.floor((100 - bubble_rate + min_profit_rates) * 10 + 0.5) / 10
+    recommend_price = np.trunc(base * recommend_rate / 100)
+    expected_profit = recommend_price - actual_total
     
-    recommend_rate = round(100 - bubble_rate + min_profit_rate, 1)
-    recommend_price = int(base_price * recommend_rate / 100)
-    expected_profit = int(recommend_price - actual_total)
+    valid = recommend_price != 0
+    safe_price = np.where(valid, recommend_price, 1)
+    profit_rate = np.where(valid, np.floor(expected_profit / safe_price * 1000 + 0.5) / 10, 0.0)
     
     return {
+        "direct": actual_direct.astype(np.int64),
+        "indirect": indirect.astype(np.int64),
+        "total": actual_total.astype(np.int64),
+        "bubble_rate": bubble_rate,
+        "band": band,
+        "recommend_rate": recommend_rate,
+        "recommend_price": recommend_price.astype(np.int64),
+        "expected_profit": expected_profit.astype(np.int64),
+        "profit_rate": profit_rate
+    }
+
+# 쿼리 파라미터를 직접 변환하므로 int()/float()가 허용하는 밑줄/공백/inf 등은 미리 걸러냄
+INT_PARAM_PATTERN = re.compile(r"[+-]?\d+", re.ASCII)
+FLOAT_PARAM_PATTERN = re.compile(r"[+-]?(?:\d+(?:\.\d*)?|\.\d+)(?:[eE][+-]?\d+)?", re.ASCII)
+
+def parse_int_param(value: str) -> int:
+    if INT_PARAM_PATTERN.fullmatch(value) is None:
+        raise ValueError(value)
+    return int(value)
+
+def parse_float_param(value: str) -> float:
+    if FLOAT_PARAM_PATTERN.fullmatch(value) is None:
+        raise ValueError(value)
+    return float(value)
+
+def _query_param(name: str, type_: str, required: bool = False, default=None) -> dict:
+    schema = {"type": type_}
+    if default is not None:
+        schema["default"] = default
+    return {"name": name, "in": "query", "required": required, "schema": schema}
+
+# 시그니처로 선언하지 않는 파라미터를 문서(OpenAPI)에 직접 명시
+FULL_ANALYSIS_POST_PARAMS = [
+    _query_param("bid_no", "string", required=True),
+    _query_param("base_price", "integer", required=True),
+    _query_param("work_type", "string", default="기타"),
+    _query_param("material_discount", "number", default=0),
+    _query_param("labor_discount", "number", default=0),
+    _query_param("equipment_discount", "number", default=0),
+    _query_param("min_profit_rate", "number", default=5.0)
+]
+
+@app.post(
+    "/api/full-analysis",
+    response_model=None,
+    openapi_extra={"parameters": FULL_ANALYSIS_POST_PARAMS}
+)
+async def full_analysis_post(request: Request) -> Response:
+    # 숫자 쿼리 파라미터 7개뿐이라 검증 모델 없이 직접 변환 (실패 시 422)
+    qp = request.query_params
+    try:
+        bid_no = qp["bid_no"]
+        base_price = parse_int_param(qp["base_price"])
+        work_type = qp.get("work_type", "기타")
+        material_discount = parse_float_param(qp.get("material_discount", "0"))
+        labor_discount = parse_float_param(qp.get("labor_discount", "0"))
+        equipment_discount = parse_float_param(qp.get("equipment_discount", "0"))
+        min_profit_rate = parse_float_param(qp.get("min_profit_rate", "5.0"))
+    except KeyError as e:
+        raise HTTPException(status_code=422, detail=f"필수 파라미터 누락: {e.args[0]}")
+    except ValueError:
+        raise HTTPException(status_code=422, detail="숫자 파라미터 형식 오류")
+    
+    r = _full_analysis_core(
+        base_price, work_type, material_discount, labor_discount, equipment_discount, min_profit_rate
+    )
+    decision, score, fit_tag, margin_tag = FULL_ANALYSIS_DECISIONS[r.band]
+    bubble_rate = r.bubble_rate
+    
+    # 같은 금액이 summary/strategy/n2b에 반복되므로 한 번씩만 포맷
+    bp_s = format_amount(base_price)
+    at_s = format_amount(r.total)
+    rp_s = format_amount(r.recommend_price)
+    ep_s = format_amount(r.expected_profit)
+    
+    payload = {
         "bid_no": bid_no,
         "summary": {
-            "기초금액": f"{base_price:,}원",
-            "예상원가": f"{actual_total:,}원",
+            "기초금액": f"{bp_s}원",
+            "예상원가": f"{at_s}원",
             "거품률": f"{bubble_rate}%",
             "판정": decision,
             "점수": f"{score}점"
         },
         "cost_analysis": {
-            "직접공사비": actual_direct,
-            "간접공사비": indirect,
-            "총원가": actual_total,
-            "절감액": base_price - actual_total
+            "직접공사비": r.direct,
+            "간접공사비": r.indirect,
+            "총원가": r.total,
+            "절감액": base_price - r.total
         },
         "n2b_decision": {
             "decision": decision,
@@ -1327,17 +1904,85 @@ async def full_analysis_post(
             "bubble_rate": bubble_rate
         },
         "strategy": {
-            "권장투찰률": f"{recommend_rate}%",
-            "권장투찰가": f"{recommend_price:,}원",
-            "예상이익": f"{expected_profit:,}원",
-            "예상이익률": f"{round(expected_profit/recommend_price*100, 1)}%"
+            "권장투찰률": f"{r.recommend_rate}%",
+            "권장투찰가": f"{rp_s}원",
+            "예상이익": f"{ep_s}원",
+            "예상이익률": f"{r.profit_rate}%"
         },
         "n2b": {
             "not": f"이 공고는 단순히 {work_type} 공사가 아닙니다",
-            "but": f"거품률 {bubble_rate}%의 {'참여 적합' if bubble_rate >= 10 else '신중 검토'} 공고입니다",
-            "because": f"원가 {actual_total:,}원 대비 기초금액 {base_price:,}원으로, 절감 여력이 {'충분' if bubble_rate >= 15 else '제한적'}합니다"
+            "but": f"거품률 {bubble_rate}%의 {fit_tag} 공고입니다",
+            "because": f"원가 {at_s}원 대비 기초금액 {bp_s}원으로, 절감 여력이 {margin_tag}합니다"
         }
     }
+    # 값이 모두 str/int/float라 인코더 변환 없이 바로 직렬화
+    return Response(content=orjson.dumps(payload), media_type="application/json")
+
+@app.post("/api/full-analysis/batch")
+def full_analysis_post_batch(req: FullAnalysisBatchRequest, request: Request):
+    ip = get_client_ip(request)
+    is_premium = request.headers.get("x-premium-key") == PREMIUM_KEY
+    
+    items = req.items
+    if len(items) > MAX_BATCH_ITEMS:
+        raise HTTPException(status_code=400, detail=f"한 번에 최대 {MAX_BATCH_ITEMS}건까지 분석 가능")
+    if any(it.base_price <= 0 for it in items):
+        raise HTTPException(status_code=400, detail="기초금액은 0보다 커야 합니다")
+    validate_batch_items(
+        items, ("material_discount", "labor_discount", "equipment_discount", "min_profit_rate")
+    )
+    
+    if not items:
+        return {"count": 0, "results": []}
+    
+    # 원가 일괄 산출과 같이 건수만큼 원가 한도 차감
+    check_rate_limit(ip, "cost", is_premium, count=len(items))
+    
+    batch = full_analysis_batch(
+        np.array([it.base_price for it in items], dtype=np.int64),
+        np.array([WORK_TYPE_INDEX.get(it.work_type, DEFAULT_WORK_TYPE_INDEX) for it in items], dtype=np.intp),
+        np.array(
+            [[it.material_discount, it.labor_discount, it.equipment_discount] for it in items],
+            dtype=np.float64
+        ),
+        np.array([it.min_profit_rate for it in items], dtype=np.float64)
+    )
+    
+    # 배열 → 파이썬 리스트는 열 단위로 한 번씩만 변환
+    columns = zip(
+        batch["direct"].tolist(),
+        batch["indirect"].tolist(),
+        batch["total"].tolist(),
+        batch["bubble_rate"].tolist(),
+        batch["band"].tolist(),
+        batch["recommend_rate"].tolist(),
+        batch["recommend_price"].tolist(),
+        batch["expected_profit"].tolist(),
+        batch["profit_rate"].tolist()
+    )
+    
+    results = []
+    for it, (direct, indirect, total, bubble_rate, band,
+             recommend_rate, recommend_price, expected_profit, profit_rate) in zip(items, columns):
+        decision, score, _, _ = FULL_ANALYSIS_DECISIONS[band]
+        results.append({
+            "bid_no": it.bid_no,
+            "기초금액": it.base_price,
+            "공종": it.work_type,
+            "직접공사비": direct,
+            "간접공사비": indirect,
+            "총원가": total,
+            "절감액": it.base_price - total,
+            "거품률": bubble_rate,
+            "판정": decision,
+            "점수": score,
+            "권장투찰률": recommend_rate,
+            "권장투찰가": recommend_price,
+            "예상이익": expected_profit,
+            "예상이익률": profit_rate
+        })
+    
+    return {"count": len(results), "results": results}
 
 # ============================================
 # 디버그 API
@@ -1370,25 +2015,25 @@ async def debug_bid_api(keyword: str = "", bid_type: str = "공사"):
         params["bidNm"] = keyword
     
     try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.get(url, params=params)
-            data = response.json() if response.status_code == 200 else None
-            
-            total_count = 0
-            if data:
-                total_count = data.get("response", {}).get("body", {}).get("totalCount", 0)
-            
-            return {
-                "url": url,
-                "bid_type": bid_type,
-                "keyword": keyword,
-                "params": {k: v for k, v in params.items() if k != "ServiceKey"},
-                "api_key_preview": PUBLIC_DATA_API_KEY[:10] + "...",
-                "status_code": response.status_code,
-                "total_count": total_count,
-                "response_preview": response.text[:500],
-                "response_json": data
-            }
+        client = app.state.http
+        response = await client.get(url, params=params)
+        data = response.json() if response.status_code == 200 else None
+
+        total_count = 0
+        if data:
+            total_count = data.get("response", {}).get("body", {}).get("totalCount", 0)
+
+        return {
+            "url": url,
+            "bid_type": bid_type,
+            "keyword": keyword,
+            "params": {k: v for k, v in params.items() if k != "ServiceKey"},
+            "api_key_preview": PUBLIC_DATA_API_KEY[:10] + "...",
+            "status_code": response.status_code,
+            "total_count": total_count,
+            "response_preview": response.text[:500],
+            "response_json": data
+        }
     except Exception as e:
         return {
             "error": str(e),
@@ -1408,15 +2053,15 @@ async def debug_price_api(keyword: str = "복공판"):
     }
     
     try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.get(url, params=params)
-            return {
-                "url": url,
-                "keyword": keyword,
-                "status_code": response.status_code,
-                "response_preview": response.text[:1000],
-                "response_json": response.json() if response.status_code == 200 else None
-            }
+        client = app.state.http
+        response = await client.get(url, params=params)
+        return {
+            "url": url,
+            "keyword": keyword,
+            "status_code": response.status_code,
+            "response_preview": response.text[:1000],
+            "response_json": response.json() if response.status_code == 200 else None
+        }
     except Exception as e:
         return {
             "url": url,
@@ -1451,52 +2096,52 @@ async def debug_bid_result_api(bid_type: str = "공사", keyword: str = ""):
         params["bidNtceNm"] = keyword
     
     try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.get(url, params=params)
-            data = response.json() if response.status_code == 200 else None
+        client = app.state.http
+        response = await client.get(url, params=params)
+        data = response.json() if response.status_code == 200 else None
+
+        total_count = 0
+        sample_items = []
+        field_names = []
+
+        if data:
+            body = data.get("response", {}).get("body", {})
+            total_count = body.get("totalCount", 0)
+            items = body.get("items", [])
             
-            total_count = 0
-            sample_items = []
-            field_names = []
+            # items 정규화
+            if isinstance(items, dict):
+                items = items.get("item", [])
+            if isinstance(items, dict):
+                items = [items]
+            if not isinstance(items, list):
+                items = []
             
-            if data:
-                body = data.get("response", {}).get("body", {})
-                total_count = body.get("totalCount", 0)
-                items = body.get("items", [])
+            # 첫 번째 아이템의 필드명 추출
+            if items:
+                field_names = list(items[0].keys())
                 
-                # items 정규화
-                if isinstance(items, dict):
-                    items = items.get("item", [])
-                if isinstance(items, dict):
-                    items = [items]
-                if not isinstance(items, list):
-                    items = []
-                
-                # 첫 번째 아이템의 필드명 추출
-                if items:
-                    field_names = list(items[0].keys())
-                    
-                    # 샘플 아이템에서 핵심 필드만 추출
-                    for item in items[:3]:
-                        sample_items.append({
-                            "bidNtceNm": item.get("bidNtceNm", ""),
-                            "presmptPrce": item.get("presmptPrce", ""),
-                            "sucsfbidAmt": item.get("sucsfbidAmt", ""),
-                            "sucsBidLwetRate": item.get("sucsBidLwetRate", ""),
-                            "sucsfbidCorpNm": item.get("sucsfbidCorpNm", ""),
-                            "bidNtceNo": item.get("bidNtceNo", ""),
-                            "opengDt": item.get("opengDt", ""),
-                        })
-            
-            return {
-                "url": url,
-                "status_code": response.status_code,
-                "total_count": total_count,
-                "field_names": field_names,
-                "sample_items": sample_items,
-                "api_key_preview": PUBLIC_DATA_API_KEY[:10] + "...",
-                "response_preview": response.text[:1000]
-            }
+                # 샘플 아이템에서 핵심 필드만 추출
+                for item in items[:3]:
+                    sample_items.append({
+                        "bidNtceNm": item.get("bidNtceNm", ""),
+                        "presmptPrce": item.get("presmptPrce", ""),
+                        "sucsfbidAmt": item.get("sucsfbidAmt", ""),
+                        "sucsBidLwetRate": item.get("sucsBidLwetRate", ""),
+                        "sucsfbidCorpNm": item.get("sucsfbidCorpNm", ""),
+                        "bidNtceNo": item.get("bidNtceNo", ""),
+                        "opengDt": item.get("opengDt", ""),
+                    })
+
+        return {
+            "url": url,
+            "status_code": response.status_code,
+            "total_count": total_count,
+            "field_names": field_names,
+            "sample_items": sample_items,
+            "api_key_preview": PUBLIC_DATA_API_KEY[:10] + "...",
+            "response_preview": response.text[:1000]
+        }
     except Exception as e:
         return {
             "url": url,
@@ -1566,108 +2211,108 @@ async def get_bid_rate(
     bid_rates = []
     
     try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.get(url, params=params)
-            
-            if response.status_code != 200:
-                return get_default_bid_rate(work_type, min_price, max_price, error=f"API status: {response.status_code}")
-            
-            data = response.json()
-            body = data.get("response", {}).get("body", {})
-            items = body.get("items", [])
-            
-            # ★ items 정규화 (dict → list 변환)
-            if isinstance(items, dict):
-                items = items.get("item", [])
-            if isinstance(items, dict):
-                items = [items]
-            if not isinstance(items, list):
-                items = []
-            
-            if not items:
-                return get_default_bid_rate(work_type, min_price, max_price, error="No items in response")
-            
-            for item in items:
+        client = app.state.http
+        response = await client.get(url, params=params)
+
+        if response.status_code != 200:
+            return get_default_bid_rate(work_type, min_price, max_price, error=f"API status: {response.status_code}")
+
+        data = response.json()
+        body = data.get("response", {}).get("body", {})
+        items = body.get("items", [])
+
+        # ★ items 정규화 (dict → list 변환)
+        if isinstance(items, dict):
+            items = items.get("item", [])
+        if isinstance(items, dict):
+            items = [items]
+        if not isinstance(items, list):
+            items = []
+
+        if not items:
+            return get_default_bid_rate(work_type, min_price, max_price, error="No items in response")
+
+        for item in items:
+            try:
+                # ★★★ 실제 API 필드명 ★★★
+                bid_name = item.get("bidNtceNm", "") or item.get("bidNm", "")
+                
+                # 낙찰금액
+                bid_price_val = item.get("sucsfbidAmt", 0)
                 try:
-                    # ★★★ 실제 API 필드명 ★★★
-                    bid_name = item.get("bidNtceNm", "") or item.get("bidNm", "")
-                    
-                    # 낙찰금액
-                    bid_price_val = item.get("sucsfbidAmt", 0)
-                    try:
-                        bid_price_val = int(float(bid_price_val or 0))
-                    except:
-                        bid_price_val = 0
-                    
-                    # ★ 낙찰률 - sucsfbidRate 필드 (실제 API 제공 필드!)
-                    direct_rate = item.get("sucsfbidRate", None) or item.get("sucsBidLwetRate", None)
-                    
-                    # 추정가격 (있으면 금액 필터링용)
-                    base_price_val = item.get("presmptPrce", 0)
+                    bid_price_val = int(float(bid_price_val or 0))
+                except:
+                    bid_price_val = 0
+                
+                # ★ 낙찰률 - sucsfbidRate 필드 (실제 API 제공 필드!)
+                direct_rate = item.get("sucsfbidRate", None) or item.get("sucsBidLwetRate", None)
+                
+                # 추정가격 (있으면 금액 필터링용)
+                base_price_val = item.get("presmptPrce", 0)
+                try:
+                    base_price_val = int(float(base_price_val or 0))
+                except:
+                    base_price_val = 0
+                
+                # 금액 범위 필터 (추정가격이 있는 경우만)
+                if base_price_val > 0 and (base_price_val < min_price or base_price_val > max_price):
+                    continue
+                
+                # 낙찰률 계산
+                rate = 0
+                if direct_rate:
                     try:
-                        base_price_val = int(float(base_price_val or 0))
+                        rate = float(direct_rate)
                     except:
-                        base_price_val = 0
-                    
-                    # 금액 범위 필터 (추정가격이 있는 경우만)
-                    if base_price_val > 0 and (base_price_val < min_price or base_price_val > max_price):
-                        continue
-                    
-                    # 낙찰률 계산
-                    rate = 0
-                    if direct_rate:
-                        try:
-                            rate = float(direct_rate)
-                        except:
-                            rate = 0
-                    elif base_price_val > 0 and bid_price_val > 0:
-                        rate = (bid_price_val / base_price_val) * 100
-                    
-                    if 70 <= rate <= 100:
-                        # 키워드 매칭 여부 표시 (매칭되면 우선)
-                        is_keyword_match = any(kw in bid_name for kw in keywords)
-                        bid_rates.append({
-                            "name": bid_name[:50],
-                            "base_price": base_price_val,
-                            "bid_price": bid_price_val,
-                            "rate": round(rate, 2),
-                            "source": "API직접" if direct_rate else "계산",
-                            "keyword_match": is_keyword_match
-                        })
-                except Exception as item_err:
-                    print(f"[bid-rate] Item parse error: {item_err}")
-                    continue
-            
-            if not bid_rates:
-                return get_default_bid_rate(work_type, min_price, max_price, 
-                                           error=f"No valid rates (total items: {len(items)})")
-            
-            # 키워드 매칭된 데이터가 있으면 우선 사용
-            keyword_matched = [r for r in bid_rates if r.get("keyword_match")]
-            use_rates = keyword_matched if len(keyword_matched) >= 3 else bid_rates
-            data_source = "공종매칭" if keyword_matched and use_rates == keyword_matched else "전체공사"
-            
-            # 평균 계산
-            avg_rate = sum(r["rate"] for r in use_rates) / len(use_rates)
-            min_rate = min(r["rate"] for r in use_rates)
-            max_rate = max(r["rate"] for r in use_rates)
-            
-            return {
-                "work_type": work_type,
-                "period": f"최근 {days}일",
-                "price_range": f"{min_price//10000000}천만원 ~ {max_price//10000000}천만원",
-                "sample_count": len(use_rates),
-                "avg_bid_rate": round(avg_rate, 2),
-                "min_bid_rate": round(min_rate, 2),
-                "max_bid_rate": round(max_rate, 2),
-                "samples": sorted(use_rates, key=lambda x: x["rate"])[:10],
-                "source": f"조달청 낙찰정보 ({data_source}, {len(keyword_matched)}건 키워드매칭 / {len(bid_rates)}건 전체)",
-                "경쟁가": {
-                    "설명": "경쟁가 = 기초금액 × 평균 낙찰률",
-                    "평균낙찰률": f"{round(avg_rate, 2)}%"
-                }
+                        rate = 0
+                elif base_price_val > 0 and bid_price_val > 0:
+                    rate = (bid_price_val / base_price_val) * 100
+                
+                if 70 <= rate <= 100:
+                    # 키워드 매칭 여부 표시 (매칭되면 우선)
+                    is_keyword_match = any(kw in bid_name for kw in keywords)
+                    bid_rates.append({
+                        "name": bid_name[:50],
+                        "base_price": base_price_val,
+                        "bid_price": bid_price_val,
+                        "rate": round(rate, 2),
+                        "source": "API직접" if direct_rate else "계산",
+                        "keyword_match": is_keyword_match
+                    })
+            except Exception as item_err:
+                print(f"[bid-rate] Item parse error: {item_err}")
+                continue
+
+        if not bid_rates:
+            return get_default_bid_rate(work_type, min_price, max_price, 
+                                       error=f"No valid rates (total items: {len(items)})")
+
+        # 키워드 매칭된 데이터가 있으면 우선 사용
+        keyword_matched = [r for r in bid_rates if r.get("keyword_match")]
+        use_rates = keyword_matched if len(keyword_matched) >= 3 else bid_rates
+        data_source = "공종매칭" if keyword_matched and use_rates == keyword_matched else "전체공사"
+
+        # 평균 계산
+        avg_rate = sum(r["rate"] for r in use_rates) / len(use_rates)
+        min_rate = min(r["rate"] for r in use_rates)
+        max_rate = max(r["rate"] for r in use_rates)
+
+        return {
+            "work_type": work_type,
+            "period": f"최근 {days}일",
+            "price_range": f"{min_price//10000000}천만원 ~ {max_price//10000000}천만원",
+            "sample_count": len(use_rates),
+            "avg_bid_rate": round(avg_rate, 2),
+            "min_bid_rate": round(min_rate, 2),
+            "max_bid_rate": round(max_rate, 2),
+            "samples": sorted(use_rates, key=lambda x: x["rate"])[:10],
+            "source": f"조달청 낙찰정보 ({data_source}, {len(keyword_matched)}건 키워드매칭 / {len(bid_rates)}건 전체)",
+            "경쟁가": {
+                "설명": "경쟁가 = 기초금액 × 평균 낙찰률",
+                "평균낙찰률": f"{round(avg_rate, 2)}%"
             }
-            
+        }
+
     except Exception as e:
         return get_default_bid_rate(work_type, min_price, max_price, error=str(e))
 
@@ -1731,8 +2376,10 @@ async def get_bid_rate_summary():
     work_types = ["도로", "토목", "건축", "전기", "설비", "조경", "상하수도", "설계", "감리", "SW개발", "전산장비"]
     results = {}
     
-    for wt in work_types:
-        result = await get_bid_rate(work_type=wt, days=90)
+    # 공종별 조회는 서로 독립적이므로 동시에 요청
+    rates = await asyncio.gather(*(get_bid_rate(work_type=wt, days=90) for wt in work_types))
+    
+    for wt, result in zip(work_types, rates):
         results[wt] = {
             "avg_rate": result["avg_bid_rate"],
             "sample_count": result["sample_count"],
@@ -1746,7 +2393,34 @@ async def get_bid_rate_summary():
     }
 
 
+# ============================================
+# 시작 시 예열
+# ============================================
+@app.on_event("startup")
+async def warm_up_kernels():
+    """산출 함수/배열 연산을 한 번씩 미리 돌려 첫 요청의 지연을 없앰"""
+    cost = calculate_rough_cost(100_000_000, "기타", 10, 15, 10)
+    analyze_n2b_decision(100_000_000, cost["실제원가"]["합계"], "기타")
+    _full_analysis_core(100_000_000, "기타", 0.0, 0.0, 0.0, 5.0)
+    calculate_rough_cost_batch(
+        np.array([100_000_000], dtype=np.int64),
+        np.array([DEFAULT_WORK_TYPE_INDEX], dtype=np.intp),
+        np.array([[10.0, 15.0, 10.0]])
+    )
+    infer_work_type("도로 포장공사")
+
+
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=10000)
+    # 사용량 카운터/캐시는 프로세스 메모리에 있어 워커마다 따로 집계됨
+    # → 기본은 단일 워커, 여러 워커는 공유 저장소 도입 후 WEB_CONCURRENCY로 지정
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=10000,
+        loop="uvloop",
+        http="httptools",
+        workers=int(os.getenv("WEB_CONCURRENCY", "1")),
+        access_log=False
+    )
     
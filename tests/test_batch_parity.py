@@ -0,0 +1,97 @@
+"""일괄 산출 엔드포인트가 단건 산출과 같은 결과를 내는지 확인
+
+실행: python -m unittest discover -s tests -t .
+"""
+import random
+import unittest
+
+from fastapi.testclient import TestClient
+
+import main
+
+# .x5 반올림 경계, 할인 0, 소수 절감률이 섞이도록 구성
+DISCOUNT_CHOICES = (0, 0, 5, 10, 15, 20, 3.35, 12.25)
+
+
+def random_discount(rng: random.Random) -> float:
+    return rng.choice(DISCOUNT_CHOICES + (rng.uniform(0, 100),))
+
+
+class BatchParityTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.client = TestClient(main.app)
+        cls.rng = random.Random(5)
+        cls.work_types = list(main.COST_RATIOS) + ["없는공종"]
+
+    def setUp(self):
+        # 일괄 요청은 건수만큼 한도를 차감하므로 요청마다 사용량 초기화
+        main.daily_usage.clear()
+
+    def post_batch(self, path: str, items: list) -> list:
+        response = self.client.post(path, headers={"x-premium-key": main.PREMIUM_KEY}, json={"items": items})
+        self.assertEqual(response.status_code, 200, response.text)
+        return response.json()["results"]
+
+    def test_cost_estimate_batch_matches_single(self):
+        rng = self.rng
+        items = [
+            {
+                "base_price": rng.choice([
+                    rng.randint(1, 1000), rng.randint(10**7, 10**10), rng.randint(1, 10**11), 0, -500
+                ]),
+                "work_type": rng.choice(self.work_types),
+                "material_discount": random_discount(rng),
+                "labor_discount": random_discount(rng),
+                "equipment_discount": random_discount(rng)
+            }
+            for _ in range(150)
+        ]
+        for item, got in zip(items, self.post_batch("/api/cost-estimate-batch", items)):
+            single = main.calculate_rough_cost(
+                item["base_price"], item["work_type"],
+                item["material_discount"], item["labor_discount"], item["equipment_discount"]
+            )
+            actual = single["실제원가"]
+            with self.subTest(item=item):
+                self.assertEqual(got["실제원가"], actual)
+                self.assertEqual(actual["재료비"] + actual["노무비"] + actual["경비"], actual["직접공사비"])
+                self.assertEqual(actual["직접공사비"] + actual["간접비"], actual["합계"])
+                self.assertEqual(got["절감금액"], single["절감금액"])
+                self.assertEqual(got["거품률"], single["거품률"])
+                self.assertEqual(got["최저투찰가"], single["투찰분석"]["최저투찰가"])
+                self.assertEqual(got["권장투찰률"], single["투찰분석"]["권장투찰률"])
+                self.assertEqual(got["권장투찰가"], single["투찰분석"]["권장투찰가"])
+
+    def test_full_analysis_batch_matches_core(self):
+        rng = self.rng
+        items = [
+            {
+                "bid_no": str(i),
+                "base_price": rng.choice([rng.randint(1000, 10**6), rng.randint(10**7, 10**11)]),
+                "work_type": rng.choice(self.work_types),
+                "material_discount": random_discount(rng),
+                "labor_discount": random_discount(rng),
+                "equipment_discount": random_discount(rng),
+                "min_profit_rate": rng.choice([0, 5.0, 12.5, rng.uniform(0, 20)])
+            }
+            for i in range(150)
+        ]
+        for item, got in zip(items, self.post_batch("/api/full-analysis/batch", items)):
+            core = main._full_analysis_core(
+                item["base_price"], item["work_type"],
+                float(item["material_discount"]), float(item["labor_discount"]),
+                float(item["equipment_discount"]), float(item["min_profit_rate"])
+            )
+            decision, score, _, _ = main.FULL_ANALYSIS_DECISIONS[core.band]
+            with self.subTest(item=item):
+                self.assertEqual(
+                    (got["직접공사비"], got["간접공사비"], got["총원가"], got["거품률"], got["판정"], got["점수"],
+                     got["권장투찰률"], got["권장투찰가"], got["예상이익"], got["예상이익률"]),
+                    (core.direct, core.indirect, core.total, core.bubble_rate, decision, score,
+                     core.recommend_rate, core.recommend_price, core.expected_profit, core.profit_rate)
+                )
+
+
+if __name__ == "__main__":
+    unittest.main()